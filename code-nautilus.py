@@ -3,13 +3,21 @@
 # Place me in ~/.local/share/nautilus-python/extensions/,
 # ensure you have python-nautilus package, restart Nautilus, and enjoy :)
 #
+# Run me with --service to start the optional launcher D-Bus service.
+#
 # This script is released to the public domain.
 
-from gi.repository import Nautilus, GObject
-from subprocess import call, CalledProcessError, DEVNULL
+from gi.repository import Nautilus, GObject, Gio, GLib
+from subprocess import Popen, run, SubprocessError, DEVNULL, PIPE
+import json
 import os
 import shutil
-import shlex
+import signal
+import socket
+import stat
+import sys
+import threading
+import time
 
 # path to vscode
 VSCODE = 'code'
@@ -24,69 +32,615 @@ KIRONAME = 'Kiro'
 # always create new window?
 NEWWINDOW = False
 
+# how long (in seconds) a captured login-shell environment is reused
+ENV_CACHE_TTL = 3600
 
-class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
+# how long (in seconds) the login shell may take to print its environment
+ENV_CAPTURE_TIMEOUT = 10
 
-    def _is_command_available(self, command):
-        """Check if a command is available in the system PATH"""
-        return shutil.which(command) is not None
+# how long (in seconds) to wait before retrying a failed capture
+ENV_RETRY_INTERVAL = 300
 
-    def _quote_path(self, path):
-        """Properly quote a file path to handle spaces and special characters"""
-        return shlex.quote(path)
+# shell startup files; editing any of them drops the cached login-shell
+# environment. Relative to $HOME:
+SHELL_RC_FILES = [
+    '.profile', '.bash_profile', '.bash_login', '.bashrc', '.zshenv',
+]
 
-    def launch_vscode(self, menu, files):
-        # Check if VSCode command is available
-        if not self._is_command_available(VSCODE):
-            return
+# relative to $ZDOTDIR, which defaults to $HOME
+ZSH_RC_FILES = ['.zshenv', '.zprofile', '.zshrc', '.zlogin']
+
+# relative to $XDG_CONFIG_HOME, which defaults to ~/.config
+FISH_RC_FILES = ['fish/config.fish']
+
+# editor command for each provider name understood by the launcher service
+EDITORS = {'vscode': VSCODE, 'kiro': KIRO}
+
+# optional launcher service, D-Bus activated, that keeps caches warm across
+# Nautilus restarts
+SERVICE_NAME = 'io.github.yanbu0.IdeNautilus'
+SERVICE_PATH = '/io/github/yanbu0/IdeNautilus'
+SERVICE_INTERFACE = 'io.github.yanbu0.IdeNautilus.Launcher'
+
+# how long (in milliseconds) to wait for the launcher service to reply
+SERVICE_CALL_TIMEOUT = 5000
+
+# how often (in seconds) the launcher service re-checks installed editors
+AVAILABILITY_REFRESH_INTERVAL = 30
+
+SERVICE_XML = """
+<node>
+  <interface name="io.github.yanbu0.IdeNautilus.Launcher">
+    <method name="OpenPaths">
+      <arg name="provider" type="s" direction="in"/>
+      <arg name="uris" type="as" direction="in"/>
+      <arg name="options" type="a{sv}" direction="in"/>
+    </method>
+    <property name="AvailableProviders" type="as" access="read"/>
+  </interface>
+</node>
+"""
+
+
+def canonicalize_paths(paths):
+    """Resolve a selection to canonical paths in a single pass.
+
+    Missing paths, duplicates and anything inside another selected directory
+    are dropped; the original order is kept. Entries are compared by device
+    and inode, so the same file reached through a symlink, bind mount or
+    hard link is only opened once. realpath() and the ancestor lookups are
+    cached per directory, so large selections stay linear.
+
+    Returns a list of (path, is_directory) tuples.
+    """
+    real_parents = {}
+    seen = set()
+    directories = set()
+    resolved = []
+
+    for path in paths:
+        if not path:
+            continue
+
+        parent, name = os.path.split(path.rstrip(os.sep) or os.sep)
+        real_parent = real_parents.get(parent)
+        if real_parent is None:
+            real_parent = real_parents[parent] = os.path.realpath(parent)
+        canonical = os.path.join(real_parent, name)
+
+        try:
+            info = os.lstat(canonical)
+            if stat.S_ISLNK(info.st_mode):
+                canonical = os.path.realpath(canonical)
+                info = os.stat(canonical)
+        except OSError:
+            continue
+
+        identity = (info.st_dev, info.st_ino)
+        if identity in seen:
+            continue
+        seen.add(identity)
+
+        is_directory = stat.S_ISDIR(info.st_mode)
+        if is_directory:
+            directories.add(identity)
+        resolved.append((canonical, is_directory))
+
+    if not directories:
+        return resolved
+
+    identities = {}
+    return [(path, is_directory) for path, is_directory in resolved
+            if not _has_selected_ancestor(path, directories, identities)]
+
+
+def _has_selected_ancestor(path, directories, identities):
+    parent = os.path.dirname(path)
+    while parent != path:
+        if parent not in identities:
+            try:
+                info = os.stat(parent)
+                identities[parent] = (info.st_dev, info.st_ino)
+            except OSError:
+                identities[parent] = None
+        if identities[parent] in directories:
+            return True
+        path, parent = parent, os.path.dirname(parent)
+    return False
+
+
+def build_argv(provider, entries):
+    """Return the command opening canonical (path, is_directory) entries"""
+    paths = [path for path, _ in entries]
+
+    # If one of the files we are trying to open is a folder
+    # create a new instance of vscode
+    if provider == 'vscode' and any(is_directory for _, is_directory in entries):
+        return [VSCODE, '--new-window'] + paths
+    return [EDITORS[provider]] + paths
+
+
+def spawn_editor(argv, spawn_helper, env=None):
+    """Start an editor without waiting for it"""
+    if spawn_helper.spawn(argv, env):
+        return
+
+    # Fall back to spawning directly if the helper is unusable
+    try:
+        Popen(argv, env=env, stdin=DEVNULL, stdout=DEVNULL,
+              stderr=DEVNULL, start_new_session=True)
+    except (SubprocessError, OSError):
+        # Gracefully handle subprocess execution failures
+        pass
+
+
+class LoginShellEnvironment:
+    """Cached snapshot of the user's login-shell environment.
+
+    Nautilus runs with the desktop session's environment, so editors it
+    launches miss PATH and friends set up in shell rc files. The snapshot is
+    captured in a background thread and handed to the editor at spawn time,
+    marked so that VS Code-family editors skip resolving it themselves.
+    """
+
+    # printed right before the environment so rc file noise can be skipped
+    _MARKER = '__CODE_NAUTILUS_ENV__'
+
+    # variables describing the capturing shell rather than the user
+    _VOLATILE = ('_', 'PWD', 'OLDPWD', 'SHLVL')
+
+    def __init__(self, shell=None, ttl=ENV_CACHE_TTL):
+        self._shell = shell or os.environ.get('SHELL')
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._env = None
+        self._captured_at = 0
+        self._rc_stamp = None
+        self._refreshing = False
+        self._failed_at = None
+        self._failed_stamp = None
+
+    def get(self):
+        """Return the cached environment, or None if there is none.
+
+        None makes the caller inherit the Nautilus environment. A snapshot
+        whose rc files changed is dropped; one that merely outlived its TTL
+        is still returned while a new capture runs. Never blocks on the
+        shell.
+        """
+        with self._lock:
+            if (self._env is not None
+                    and self._rc_stamp != self._rc_files_stamp(self._env)):
+                self._env = None
+            env = self._env
+            expired = env is None or time.monotonic() - self._captured_at >= self._ttl
+        if expired:
+            self.refresh_async()
+        return None if env is None else dict(env)
+
+    def refresh_async(self):
+        """Capture the login-shell environment in a background thread.
+
+        After a failed capture, retries wait ENV_RETRY_INTERVAL seconds
+        unless a shell rc file changes in the meantime.
+        """
+        with self._lock:
+            if self._refreshing or self._backing_off():
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _backing_off(self):
+        return (self._failed_at is not None
+                and time.monotonic() - self._failed_at < ENV_RETRY_INTERVAL
+                and self._failed_stamp == self._rc_files_stamp(self._env))
+
+    @staticmethod
+    def _rc_files(env):
+        # zsh and fish look in directories that are often set by the shell
+        # itself, so prefer the captured environment
+        def lookup(name, default):
+            return (env or {}).get(name) or os.environ.get(name) or default
+
+        home = os.path.expanduser('~')
+        zdotdir = lookup('ZDOTDIR', home)
+        config = lookup('XDG_CONFIG_HOME', os.path.join(home, '.config'))
+        return ([os.path.join(home, name) for name in SHELL_RC_FILES]
+                + [os.path.join(zdotdir, name) for name in ZSH_RC_FILES]
+                + [os.path.join(config, name) for name in FISH_RC_FILES])
+
+    def _rc_files_stamp(self, env):
+        stamp = []
+        for path in self._rc_files(env):
+            try:
+                stamp.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                stamp.append((path, None))
+        return tuple(stamp)
+
+    def _refresh(self):
+        try:
+            # Stamp before capturing so an rc edit made meanwhile still
+            # invalidates the snapshot
+            stamp = self._rc_files_stamp(self._env)
+            env = self._capture()
+            if env is not None and self._rc_files(env) != self._rc_files(self._env):
+                # The new snapshot moved ZDOTDIR or XDG_CONFIG_HOME
+                stamp = self._rc_files_stamp(env)
+            with self._lock:
+                if env is None:
+                    self._failed_at = time.monotonic()
+                    self._failed_stamp = stamp
+                else:
+                    self._env = env
+                    self._captured_at = time.monotonic()
+                    self._rc_stamp = stamp
+                    self._failed_at = None
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _capture(self):
+        if not self._shell:
+            return None
+
+        script = "printf '%s' " + self._MARKER + '; command env -0'
+        try:
+            result = run([self._shell, '-l', '-i', '-c', script],
+                         stdin=DEVNULL, stdout=PIPE, stderr=DEVNULL,
+                         timeout=ENV_CAPTURE_TIMEOUT, start_new_session=True)
+        except (SubprocessError, OSError):
+            return None
+
+        _, found, payload = result.stdout.partition(self._MARKER.encode())
+        if result.returncode != 0 or not found:
+            return None
+
+        env = {}
+        for entry in payload.split(b'\0'):
+            key, sep, value = entry.partition(b'=')
+            if sep and key:
+                env[os.fsdecode(key)] = os.fsdecode(value)
+        for name in self._VOLATILE:
+            env.pop(name, None)
+
+        # VS Code-family editors only resolve the shell environment when
+        # they were not started from their CLI
+        env['VSCODE_CLI'] = '1'
+        return env
+
+
+class SpawnHelper:
+    """Small helper process that launches editors on behalf of Nautilus.
+
+    Forking Nautilus itself gets slower as its address space grows, so the
+    helper is forked once while the process is still small. Launch requests
+    (argv, env, cwd) are sent to it as JSON lines over a Unix socket pair;
+    it is restarted if it has died by the time a request is sent.
+    """
 
-        safepaths = ''
-        args = ''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._sock = None
 
-        for file in files:
-            filepath = file.get_location().get_path()
-            if filepath and os.path.exists(filepath):
+    def start(self):
+        """Fork the helper process; returns False if forking failed"""
+        parent_sock, child_sock = socket.socketpair()
+        try:
+            pid = os.fork()
+        except OSError:
+            parent_sock.close()
+            child_sock.close()
+            return False
+
+        if pid == 0:
+            # Never return into Nautilus code from the child
+            try:
+                parent_sock.close()
+                self._serve(child_sock)
+            finally:
+                os._exit(0)
+
+        child_sock.close()
+        self._pid = pid
+        self._sock = parent_sock
+        return True
+
+    def spawn(self, argv, env=None, cwd=None):
+        """Ask the helper to start argv; returns False if it could not be reached"""
+        message = json.dumps({'argv': argv, 'env': env, 'cwd': cwd}) + '\n'
+
+        with self._lock:
+            # A second attempt covers a helper that died since the last launch
+            for _ in range(2):
+                if not self._is_alive():
+                    self._stop()
+                    if not self.start():
+                        return False
                 try:
-                safepaths += self._quote_path(filepath) + ' '
-
-                # If one of the files we are trying to open is a folder
-                # create a new instance of vscode
-                if os.path.isdir(filepath):
-                    args = '--new-window '
-
-                    # Check if any of the files is a directory
-                    if os.path.isdir(filepath):
-                        has_directory = True
-                        
-                except Exception as e:
-                    invalid_paths.append(f"{filepath} (error: {str(e)})")
-                    continue
+                    self._sock.sendall(message.encode(), socket.MSG_NOSIGNAL)
+                    return True
+                except OSError:
+                    self._stop()
+        return False
 
-        if safepaths.strip():  # Only execute if we have valid paths
+    def _is_alive(self):
+        if self._pid is None:
+            return False
+        try:
+            pid, _ = os.waitpid(self._pid, os.WNOHANG)
+        except ChildProcessError:
+            pid = self._pid
+        if pid != 0:
+            # Already reaped, so the pid must not be signalled any more
+            self._pid = None
+            return False
+        return True
+
+    def _stop(self):
+        if self._sock is not None:
+            self._sock.close()
+        if self._pid is not None:
             try:
-                call(VSCODE + ' ' + args + safepaths + '&', shell=True)
-            except (CalledProcessError, OSError):
-                # Gracefully handle subprocess execution failures
+                os.kill(self._pid, signal.SIGTERM)
+                os.waitpid(self._pid, 0)
+            except (ProcessLookupError, ChildProcessError):
                 pass
+        self._pid = None
+        self._sock = None
 
-    def launch_kiro(self, menu, files):
-        # Check if Kiro command is available
-        if not self._is_command_available(KIRO):
+    @staticmethod
+    def _start_editor(request):
+        argv = request['argv']
+        env = request['env']
+        if request['cwd']:
+            os.chdir(request['cwd'])
+        os.posix_spawnp(
+            argv[0], argv, os.environ if env is None else env, setsid=True,
+            file_actions=[
+                (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+            ])
+
+    @staticmethod
+    def _serve(sock):
+        # Runs until Nautilus closes its end of the socket
+        with sock.makefile('rb') as requests:
+            for line in requests:
+                try:
+                    request = json.loads(line)
+                    pid = os.fork()
+                except (ValueError, OSError):
+                    continue
+
+                # Double fork: the intermediate child exits as soon as the
+                # editor is started, so the editor is re-parented and the
+                # helper never needs to wait for it. SIGCHLD is left alone
+                # because ignoring it would be inherited by the editor.
+                if pid == 0:
+                    try:
+                        SpawnHelper._start_editor(request)
+                    except (KeyError, IndexError, TypeError, ValueError, OSError):
+                        pass
+                    finally:
+                        os._exit(0)
+                os.waitpid(pid, 0)
+
+
+class LauncherService:
+    """Optional D-Bus service that launches editors for the extension.
+
+    It is started through D-Bus activation and outlives Nautilus restarts,
+    so the login-shell environment, the installed-editor lookup and the
+    spawn helper stay warm while the extension itself starts cold.
+    """
+
+    def __init__(self):
+        self.spawn_helper = SpawnHelper()
+        self.spawn_helper.start()
+        self.login_env = LoginShellEnvironment()
+        self.login_env.refresh_async()
+        self._available = self._find_available_providers()
+        self._connection = None
+        self._loop = GLib.MainLoop()
+
+    def run(self):
+        """Own the service name on the session bus and serve until it is lost"""
+        interface_info = Gio.DBusNodeInfo.new_for_xml(SERVICE_XML).interfaces[0]
+        Gio.bus_own_name(
+            Gio.BusType.SESSION, SERVICE_NAME, Gio.BusNameOwnerFlags.NONE,
+            lambda connection, name: self._on_bus_acquired(connection, interface_info),
+            None,
+            lambda connection, name: self._loop.quit())
+        GLib.timeout_add_seconds(AVAILABILITY_REFRESH_INTERVAL, self._refresh_available)
+        self._loop.run()
+
+    def open_paths(self, provider, uris, options):
+        """Open file URIs in provider; options are reserved for future use"""
+        if provider not in EDITORS:
+            raise ValueError('Unknown provider: ' + provider)
+
+        selection = [Gio.File.new_for_uri(uri).get_path() for uri in uris]
+        entries = canonicalize_paths(selection)
+        if entries:  # Only execute if we have valid paths
+            spawn_editor(build_argv(provider, entries), self.spawn_helper,
+                         self.login_env.get())
+
+    def _on_bus_acquired(self, connection, interface_info):
+        self._connection = connection
+        connection.register_object(SERVICE_PATH, interface_info,
+                                   self._on_method_call,
+                                   self._on_get_property, None)
+
+    def _on_method_call(self, connection, sender, object_path, interface_name,
+                        method_name, parameters, invocation):
+        # OpenPaths is the only method; GDBus rejects anything else. Every
+        # call must be answered, or the client waits for the timeout and
+        # does not fall back.
+        try:
+            self.open_paths(*parameters.unpack())
+        except ValueError as error:
+            invocation.return_dbus_error('org.freedesktop.DBus.Error.InvalidArgs',
+                                         str(error))
+            return
+        except Exception as error:
+            invocation.return_dbus_error('org.freedesktop.DBus.Error.Failed',
+                                         str(error))
             return
+        invocation.return_value(None)
 
-        safepaths = ''
+    def _on_get_property(self, connection, sender, object_path, interface_name,
+                         property_name):
+        return GLib.Variant('as', sorted(self._available))
 
-        for file in files:
-            filepath = file.get_location().get_path()
-            if filepath and os.path.exists(filepath):
-                safepaths += self._quote_path(filepath) + ' '
+    def _find_available_providers(self):
+        # The bus starts the service with the thin session environment, so
+        # look editors up on the login shell's PATH once it is known
+        env = self.login_env.get() or os.environ
+        return {provider for provider, command in EDITORS.items()
+                if shutil.which(command, path=env.get('PATH')) is not None}
 
-        if safepaths.strip():  # Only execute if we have valid paths
-            try:
-                call(KIRO + ' ' + safepaths + '&', shell=True)
-            except (CalledProcessError, OSError):
-                # Gracefully handle subprocess execution failures
-                pass
+    def _refresh_available(self):
+        available = self._find_available_providers()
+        if available != self._available:
+            self._available = available
+            if self._connection is not None:
+                changed = {'AvailableProviders': GLib.Variant('as', sorted(available))}
+                self._connection.emit_signal(
+                    None, SERVICE_PATH, 'org.freedesktop.DBus.Properties',
+                    'PropertiesChanged',
+                    GLib.Variant('(sa{sv}as)', (SERVICE_INTERFACE, changed, [])))
+        return GLib.SOURCE_CONTINUE
+
+
+class LauncherClient:
+    """Non-blocking client for the optional launcher service.
+
+    All D-Bus traffic is asynchronous. Until the service answers, or when it
+    is not installed, callers get None or have their fallback invoked so
+    they can work in-process. on_unavailable is called once the service
+    turns out to be missing, so that work can be prepared early.
+    """
+
+    def __init__(self, connection=None, on_unavailable=None):
+        self._proxy = None
+        self._ready = False
+        self._on_unavailable = on_unavailable
+        args = (Gio.DBusProxyFlags.NONE, None, SERVICE_NAME, SERVICE_PATH,
+                SERVICE_INTERFACE, None, self._on_proxy_ready)
+        if connection is None:
+            Gio.DBusProxy.new_for_bus(Gio.BusType.SESSION, *args,
+                                      Gio.DBusProxy.new_for_bus_finish)
+        else:
+            Gio.DBusProxy.new(connection, *args, Gio.DBusProxy.new_finish)
+
+    def available_providers(self):
+        """Return the providers the service found installed, or None if unknown"""
+        if self._proxy is None or self._proxy.get_name_owner() is None:
+            return None
+        value = self._proxy.get_cached_property('AvailableProviders')
+        return None if value is None else value.unpack()
+
+    def open_paths(self, provider, uris, options, fallback):
+        """Ask the service to open uris in provider, calling fallback() if it cannot"""
+        if self._proxy is None:
+            fallback()
+            return
+
+        parameters = GLib.Variant('(sasa{sv})', (provider, uris, options))
+        self._proxy.call('OpenPaths', parameters, Gio.DBusCallFlags.NONE,
+                         SERVICE_CALL_TIMEOUT, None, self._on_open_paths_done,
+                         fallback)
+
+    def _on_proxy_ready(self, source, result, finish):
+        try:
+            self._proxy = finish(result)
+        except GLib.Error:
+            self._proxy = None
+        self._ready = True
+
+        # Creating the proxy already tried to activate the service, so no
+        # owner now means it is not installed
+        missing = self._proxy is None or self._proxy.get_name_owner() is None
+        if missing and self._on_unavailable is not None:
+            self._on_unavailable()
+
+    @staticmethod
+    def _on_open_paths_done(proxy, result, fallback):
+        try:
+            proxy.call_finish(result)
+        except GLib.Error as error:
+            # After our own timeout the service may still launch the editor,
+            # so falling back could open it twice. NoReply arrives earlier
+            # and means the service went away, so that falls back too.
+            if not error.matches(Gio.io_error_quark(), Gio.IOErrorEnum.TIMED_OUT):
+                fallback()
+
+
+class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
+
+    def __init__(self):
+        super().__init__()
+        # The spawn helper and the login-shell environment are only needed
+        # when launching in-process. With the launcher service installed
+        # they are never created, so Nautilus starts without forking or
+        # running a login shell. Without the service they are prepared as
+        # soon as that is known, shortly after start-up while Nautilus is
+        # still small; a fallback after a service failure may have to fork
+        # the grown process once.
+        self.spawn_helper = None
+        self.login_env = None
+        self.launcher = LauncherClient(on_unavailable=self._prepare_fallback)
+
+    def _prepare_fallback(self):
+        """Set up in-process launching, once"""
+        if self.spawn_helper is not None:
+            return
+        self.spawn_helper = SpawnHelper()
+        self.spawn_helper.start()
+        self.login_env = LoginShellEnvironment()
+        self.login_env.refresh_async()
+
+    def _is_command_available(self, command):
+        """Check if a command is available in the system PATH"""
+        return shutil.which(command) is not None
+
+    def _is_provider_available(self, provider):
+        """Check if an editor is available, preferring the launcher service's answer"""
+        available = self.launcher.available_providers()
+        if available is not None:
+            return provider in available
+        return self._is_command_available(EDITORS[provider])
+
+    def _spawn(self, argv):
+        """Start an editor without waiting for it"""
+        spawn_editor(argv, self.spawn_helper, self.login_env.get())
+
+    def launch_vscode(self, menu, files):
+        self._launch('vscode', files)
+
+    def launch_kiro(self, menu, files):
+        self._launch('kiro', files)
+
+    def _launch(self, provider, files):
+        # Check if the editor command is available
+        if not self._is_provider_available(provider):
+            return
+
+        locations = [file.get_location() for file in files]
+        uris = [location.get_uri() for location in locations]
+        self.launcher.open_paths(
+            provider, uris, {},
+            lambda: self._launch_in_process(provider, locations))
+
+    def _launch_in_process(self, provider, locations):
+        self._prepare_fallback()
+        selection = [location.get_path() for location in locations]
+        entries = canonicalize_paths(selection)
+        if entries:  # Only execute if we have valid paths
+            self._spawn(build_argv(provider, entries))
 
     def get_file_items(self, *args):
         """Generate menu items for file selection"""
@@ -94,7 +648,7 @@ class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
         items = []
         
         # VSCode menu item (only if command is available)
-        if self._is_command_available(VSCODE):
+        if self._is_provider_available('vscode'):
             vscode_item = Nautilus.MenuItem(
                 name='VSCodeOpen',
                 label='Open in ' + VSCODENAME,
@@ -104,7 +658,7 @@ class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
             items.append(vscode_item)
         
         # Kiro menu item (only if command is available)
-        if self._is_command_available(KIRO):
+        if self._is_provider_available('kiro'):
             kiro_item = Nautilus.MenuItem(
                 name='KiroOpen',
                 label='Open in ' + KIRONAME,
@@ -121,7 +675,7 @@ class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
         items = []
         
         # VSCode menu item (only if command is available)
-        if self._is_command_available(VSCODE):
+        if self._is_provider_available('vscode'):
             vscode_item = Nautilus.MenuItem(
                 name='VSCodeOpenBackground',
                 label='Open in ' + VSCODENAME,
@@ -131,7 +685,7 @@ class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
             items.append(vscode_item)
         
         # Kiro menu item (only if command is available)
-        if self._is_command_available(KIRO):
+        if self._is_provider_available('kiro'):
             kiro_item = Nautilus.MenuItem(
                 name='KiroOpenBackground',
                 label='Open in ' + KIRONAME,
@@ -141,3 +695,9 @@ class VSCodeKiroExtension(GObject.GObject, Nautilus.MenuProvider):
             items.append(kiro_item)
 
         return items
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['--service']:
+        sys.exit('usage: code-nautilus.py --service')
+    LauncherService().run()
@@ -9,6 +9,21 @@ check_command() {
     fi
 }
 
+# Parse options
+with_service=false
+for arg in "$@"; do
+    case "$arg" in
+        --with-service)
+            with_service=true
+            ;;
+        *)
+            echo "✗ Unknown option: $arg"
+            echo "Usage: $0 [--with-service]"
+            exit 1
+            ;;
+    esac
+done
+
 # Install python-nautilus
 echo "Installing python-nautilus..."
 if type "pacman" > /dev/null 2>&1
@@ -103,6 +118,8 @@ mkdir -p ~/.local/share/nautilus-python/extensions
 rm -f ~/.local/share/nautilus-python/extensions/VSCodeExtension.py
 rm -f ~/.local/share/nautilus-python/extensions/code-nautilus.py
 rm -f ~/.local/share/nautilus-python/extensions/kiro-nautilus.py
+rm -f ~/.local/share/dbus-1/services/io.github.yanbu0.IdeNautilus.service
+pkill -f "code-nautilus.py --service" 2> /dev/null
 echo "✓ Previous extensions removed"
 
 echo ""
@@ -127,6 +144,23 @@ else
     exit 1
 fi
 
+# Install the optional launcher service
+if [ "$with_service" = true ]; then
+    echo ""
+    echo "Installing launcher D-Bus service..."
+    mkdir -p ~/.local/share/dbus-1/services
+    cat > ~/.local/share/dbus-1/services/io.github.yanbu0.IdeNautilus.service << EOF
+[D-BUS Service]
+Name=io.github.yanbu0.IdeNautilus
+Exec=/usr/bin/env python3 $HOME/.local/share/nautilus-python/extensions/code-nautilus.py --service
+EOF
+    if [ $? -eq 0 ]; then
+        echo "✓ Launcher service installed successfully"
+    else
+        echo "⚠ Failed to install launcher service - editors will be launched by Nautilus directly"
+    fi
+fi
+
 # Restart nautilus
 echo ""
 echo "Restarting Nautilus..."
@@ -147,6 +181,9 @@ fi
 if [ "$kiro_available" = true ]; then
     echo "  ✓ Open in Kiro (right-click context menu)"
 fi
+if [ "$with_service" = true ]; then
+    echo "  ✓ Launcher service (keeps caches warm across Nautilus restarts)"
+fi
 echo ""
 echo "The extension will automatically detect which editors are available"
 echo "and show the appropriate menu items in Nautilus."
@@ -96,7 +96,7 @@ def discover_and_run_tests():
     # Discover tests
     loader = unittest.TestLoader()
     start_dir = test_dir
-    suite = loader.discover(start_dir, pattern='test_extension.py')
+    suite = loader.discover(start_dir, pattern='test_*.py')
     
     # Count tests
     test_count = suite.countTestCases()
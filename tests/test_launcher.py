@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Test suite for the launcher parts of the code-nautilus Python extension.
+
+This module contains tests for:
+- The cached login-shell environment snapshot
+- The pre-forked spawn helper
+- Selection canonicalization and de-duplication
+- The optional launcher D-Bus service and its client
+
+These tests only need PyGObject with Gio/GLib; the Nautilus typelib is
+replaced by a minimal stand-in when it is not installed.
+"""
+
+import importlib
+import unittest
+import sys
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+import types
+from unittest.mock import Mock, patch
+from unittest import TestCase
+
+try:
+    from gi.repository import Gio, GLib
+except ImportError:
+    raise unittest.SkipTest('PyGObject is required')
+
+# The launcher code does not use Nautilus itself, so let the module import
+# on machines without the Nautilus typelib
+try:
+    importlib.import_module('gi.repository.Nautilus')
+    HAVE_NAUTILUS = True
+except ImportError:
+    class _MenuProvider:
+        pass
+    sys.modules['gi.repository.Nautilus'] = types.SimpleNamespace(
+        MenuProvider=_MenuProvider, MenuItem=Mock)
+    HAVE_NAUTILUS = False
+
+# Import the extension module
+# Note: The file is named code-nautilus.py, so we need to import it specially
+import importlib.util
+EXTENSION_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code-nautilus.py")
+spec = importlib.util.spec_from_file_location("code_nautilus", EXTENSION_PATH)
+code_nautilus = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(code_nautilus)
+
+VSCodeKiroExtension = code_nautilus.VSCodeKiroExtension
+
+
+class TestLoginShellEnvironment(TestCase):
+    """Tests for the cached login-shell environment snapshot"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.login_env = code_nautilus.LoginShellEnvironment(shell='/bin/bash', ttl=60)
+        self.output = (b'rc file noise' + b'__CODE_NAUTILUS_ENV__'
+                       + b'PATH=/home/user/.nvm/bin:/usr/bin\0PWD=/tmp\0SHLVL=2\0')
+    
+    def _capture_snapshot(self, env, stamp=(1,)):
+        with patch.object(self.login_env, '_rc_files_stamp', return_value=stamp):
+            with patch.object(self.login_env, '_capture', return_value=env):
+                self.login_env._refresh()
+    
+    def test_capture_parses_environment_after_marker(self):
+        """Test capture skips rc output and drops shell-specific variables"""
+        with patch.object(code_nautilus, 'run', return_value=Mock(returncode=0, stdout=self.output)):
+            env = self.login_env._capture()
+        
+        self.assertEqual(env['PATH'], '/home/user/.nvm/bin:/usr/bin')
+        self.assertNotIn('PWD', env)
+        self.assertNotIn('SHLVL', env)
+        # Marker that makes VS Code-family editors skip their own resolution
+        self.assertEqual(env['VSCODE_CLI'], '1')
+    
+    def test_capture_failure_returns_none(self):
+        """Test a failing or timing out login shell yields no snapshot"""
+        with patch.object(code_nautilus, 'run',
+                          side_effect=subprocess.TimeoutExpired('bash', 10)):
+            self.assertIsNone(self.login_env._capture())
+        with patch.object(code_nautilus, 'run', return_value=Mock(returncode=1, stdout=self.output)):
+            self.assertIsNone(self.login_env._capture())
+    
+    def test_get_without_snapshot_schedules_refresh(self):
+        """Test get() does not block and schedules a capture when empty"""
+        with patch.object(self.login_env, 'refresh_async') as mock_refresh:
+            self.assertIsNone(self.login_env.get())
+            mock_refresh.assert_called_once()
+    
+    def test_rc_file_change_invalidates_snapshot(self):
+        """Test the snapshot is dropped once a shell rc file changes"""
+        self._capture_snapshot({'PATH': '/x'})
+        with patch.object(self.login_env, '_rc_files_stamp', return_value=(1,)):
+            self.assertEqual(self.login_env.get(), {'PATH': '/x'})
+        
+        with patch.object(self.login_env, '_rc_files_stamp', return_value=(2,)):
+            with patch.object(self.login_env, 'refresh_async'):
+                self.assertIsNone(self.login_env.get())
+    
+    def test_zdotdir_rc_file_change_invalidates_snapshot(self):
+        """Test zsh rc files are watched in the captured ZDOTDIR"""
+        zdotdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, zdotdir)
+        zshrc = os.path.join(zdotdir, '.zshrc')
+        open(zshrc, 'w').close()
+        os.utime(zshrc, ns=(1, 1))
+        
+        with patch.object(self.login_env, '_capture',
+                          return_value={'PATH': '/x', 'ZDOTDIR': zdotdir}):
+            self.login_env._refresh()
+        self.assertEqual(self.login_env.get()['ZDOTDIR'], zdotdir)
+        
+        os.utime(zshrc, ns=(2, 2))
+        with patch.object(self.login_env, 'refresh_async'):
+            self.assertIsNone(self.login_env.get())
+    
+    def test_rc_files_fall_back_to_process_environment(self):
+        """Test ZDOTDIR and XDG_CONFIG_HOME come from os.environ without a snapshot"""
+        with patch.dict(os.environ, {'ZDOTDIR': '/zdot', 'XDG_CONFIG_HOME': '/config'}):
+            files = self.login_env._rc_files(None)
+            snapshot_files = self.login_env._rc_files({'ZDOTDIR': '/other'})
+        
+        self.assertIn('/zdot/.zshrc', files)
+        self.assertIn('/config/fish/config.fish', files)
+        self.assertIn('/other/.zshrc', snapshot_files)
+        self.assertNotIn('/zdot/.zshrc', snapshot_files)
+    
+    def test_expired_snapshot_is_served_while_refreshing(self):
+        """Test an expired snapshot is still returned while a capture runs"""
+        self._capture_snapshot({'PATH': '/x'})
+        self.login_env._captured_at -= 120
+        
+        with patch.object(self.login_env, '_rc_files_stamp', return_value=(1,)):
+            with patch.object(self.login_env, 'refresh_async') as mock_refresh:
+                self.assertEqual(self.login_env.get(), {'PATH': '/x'})
+                mock_refresh.assert_called_once()
+    
+    def test_failed_capture_backs_off(self):
+        """Test a failed capture is not retried until the retry interval passes"""
+        self._capture_snapshot(None)
+        
+        with patch.object(self.login_env, '_rc_files_stamp', return_value=(1,)):
+            with patch('threading.Thread') as mock_thread:
+                self.login_env.refresh_async()
+                mock_thread.assert_not_called()
+                
+                self.login_env._failed_at -= code_nautilus.ENV_RETRY_INTERVAL
+                self.login_env.refresh_async()
+                mock_thread.assert_called_once()
+    
+    def test_rc_file_change_ends_back_off(self):
+        """Test editing an rc file allows retrying a failed capture at once"""
+        self._capture_snapshot(None)
+        
+        with patch.object(self.login_env, '_rc_files_stamp', return_value=(2,)):
+            with patch('threading.Thread') as mock_thread:
+                self.login_env.refresh_async()
+                mock_thread.assert_called_once()
+
+
+class TestSpawnHelper(TestCase):
+    """Tests for the pre-forked spawn helper process"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.helper = code_nautilus.SpawnHelper()
+        self.tmpdir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Stop the helper and remove temporary files"""
+        self.helper._stop()
+        shutil.rmtree(self.tmpdir)
+    
+    def _wait_for(self, path, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return os.path.exists(path)
+    
+    def test_helper_spawns_requested_command(self):
+        """Test the helper runs argv with the given env and cwd"""
+        self.assertTrue(self.helper.start())
+        
+        env = {'PATH': os.environ.get('PATH', '/usr/bin:/bin')}
+        self.assertTrue(self.helper.spawn(['touch', 'launched'], env, self.tmpdir))
+        
+        self.assertTrue(self._wait_for(os.path.join(self.tmpdir, 'launched')))
+    
+    def test_helper_restarts_after_dying(self):
+        """Test a dead helper is restarted on the next launch request"""
+        self.assertTrue(self.helper.start())
+        old_pid = self.helper._pid
+        os.kill(old_pid, signal.SIGKILL)
+        os.waitpid(old_pid, 0)
+        
+        target = os.path.join(self.tmpdir, 'relaunched')
+        self.assertTrue(self.helper.spawn(['touch', target]))
+        
+        self.assertNotEqual(self.helper._pid, old_pid)
+        self.assertTrue(self._wait_for(target))
+    
+    def test_launched_process_keeps_default_sigchld(self):
+        """Test editors do not inherit an ignored SIGCHLD from the helper"""
+        self.assertTrue(self.helper.start())
+        target = os.path.join(self.tmpdir, 'child-status')
+        script = ('import signal, subprocess\n'
+                  'default = signal.getsignal(signal.SIGCHLD) == signal.SIG_DFL\n'
+                  'status = subprocess.run(["false"]).returncode\n'
+                  'open(%r + ".tmp", "w").write("%%s %%s" %% (default, status))\n'
+                  'import os; os.rename(%r + ".tmp", %r)\n' % (target, target, target))
+        
+        self.assertTrue(self.helper.spawn([sys.executable, '-c', script]))
+        
+        self.assertTrue(self._wait_for(target))
+        with open(target) as status:
+            self.assertEqual(status.read(), 'True 1')
+
+
+class TestVSCodeKiroExtension(TestCase):
+    """Tests for how the extension launches editors in-process"""
+    
+    def test_spawn_falls_back_when_helper_unusable(self):
+        """Test the extension spawns directly if the helper cannot be reached"""
+        extension = VSCodeKiroExtension.__new__(VSCodeKiroExtension)
+        extension.spawn_helper = Mock()
+        extension.spawn_helper.spawn.return_value = False
+        extension.login_env = Mock()
+        extension.login_env.get.return_value = None
+        
+        with patch.object(code_nautilus, 'Popen') as mock_popen:
+            extension._spawn(['code', '/tmp'])
+        
+        mock_popen.assert_called_once()
+        self.assertEqual(mock_popen.call_args[0][0], ['code', '/tmp'])
+    
+    def test_prepares_fallback_once(self):
+        """Test the extension creates its spawn helper lazily and only once"""
+        extension = VSCodeKiroExtension.__new__(VSCodeKiroExtension)
+        extension.spawn_helper = None
+        extension.login_env = None
+        
+        with patch.object(code_nautilus, 'SpawnHelper') as mock_helper:
+            with patch.object(code_nautilus, 'LoginShellEnvironment'):
+                extension._prepare_fallback()
+                extension._prepare_fallback()
+        
+        mock_helper.return_value.start.assert_called_once()
+
+
+class TestCanonicalizePaths(TestCase):
+    """Tests for selection canonicalization and de-duplication"""
+    
+    def setUp(self):
+        """Create a small tree with a symlinked workspace"""
+        self.tmpdir = os.path.realpath(tempfile.mkdtemp())
+        self.project = os.path.join(self.tmpdir, 'project')
+        os.makedirs(os.path.join(self.project, 'src'))
+        for name in ('a.py', 'b.py'):
+            open(os.path.join(self.project, 'src', name), 'w').close()
+        open(os.path.join(self.tmpdir, 'notes.txt'), 'w').close()
+        self.link = os.path.join(self.tmpdir, 'workspace')
+        os.symlink(self.project, self.link)
+    
+    def tearDown(self):
+        """Remove temporary files"""
+        shutil.rmtree(self.tmpdir)
+    
+    def test_symlinked_duplicates_are_dropped(self):
+        """Test the same file reached via a symlink is only kept once"""
+        real = os.path.join(self.project, 'src', 'a.py')
+        linked = os.path.join(self.link, 'src', 'a.py')
+        
+        result = code_nautilus.canonicalize_paths([linked, real])
+        
+        self.assertEqual(result, [(real, False)])
+    
+    def test_hard_linked_duplicates_are_dropped(self):
+        """Test two paths to the same inode are only kept once"""
+        original = os.path.join(self.project, 'src', 'a.py')
+        linked = os.path.join(self.tmpdir, 'a-link.py')
+        os.link(original, linked)
+        
+        result = code_nautilus.canonicalize_paths([linked, original])
+        
+        self.assertEqual(result, [(linked, False)])
+    
+    def test_descendants_of_selected_directories_are_dropped(self):
+        """Test entries inside a selected directory are dropped, order kept"""
+        notes = os.path.join(self.tmpdir, 'notes.txt')
+        selection = [
+            notes,
+            os.path.join(self.project, 'src', 'a.py'),
+            self.link,
+            os.path.join(self.project, 'src'),
+        ]
+        
+        result = code_nautilus.canonicalize_paths(selection)
+        
+        self.assertEqual(result, [(notes, False), (self.project, True)])
+    
+    def test_missing_and_empty_paths_are_dropped(self):
+        """Test nonexistent paths and files without a local path are skipped"""
+        missing = os.path.join(self.tmpdir, 'missing.txt')
+        
+        self.assertEqual(code_nautilus.canonicalize_paths([None, '', missing]), [])
+    
+    def test_realpath_called_once_per_directory(self):
+        """Test large selections only resolve each parent directory once"""
+        src = os.path.join(self.link, 'src')
+        selection = [os.path.join(src, 'a.py'), os.path.join(src, 'b.py')] * 1000
+        
+        with patch('os.path.realpath', wraps=os.path.realpath) as mock_realpath:
+            result = code_nautilus.canonicalize_paths(selection)
+        
+        self.assertEqual(mock_realpath.call_count, 1)
+        self.assertEqual([path for path, _ in result], [
+            os.path.join(self.project, 'src', 'a.py'),
+            os.path.join(self.project, 'src', 'b.py'),
+        ])
+
+
+@unittest.skipUnless(shutil.which('dbus-daemon'), 'dbus-daemon is required')
+class TestLauncherService(TestCase):
+    """Integration tests for the launcher service on a private session bus"""
+    
+    def setUp(self):
+        """Start a private bus and a fake 'code' editor"""
+        self.tmpdir = os.path.realpath(tempfile.mkdtemp())
+        self.project = os.path.join(self.tmpdir, 'project')
+        os.mkdir(self.project)
+        self.output = os.path.join(self.tmpdir, 'launched')
+        
+        bindir = os.path.join(self.tmpdir, 'bin')
+        os.mkdir(bindir)
+        editor = os.path.join(bindir, 'code')
+        with open(editor, 'w') as script:
+            script.write('#!/bin/sh\necho "$@" > %s\n' % self.output)
+        os.chmod(editor, 0o755)
+        
+        self.env = dict(os.environ, PATH=bindir + os.pathsep + os.environ.get('PATH', ''))
+        # Without a shell no login environment is captured
+        self.env.pop('SHELL', None)
+        
+        # Activatable services of the private bus are looked up here
+        self.env['XDG_DATA_HOME'] = os.path.join(self.tmpdir, 'share')
+        self.bus = subprocess.Popen(['dbus-daemon', '--session', '--nofork', '--print-address'],
+                                    stdout=subprocess.PIPE, text=True, env=self.env)
+        self.env['DBUS_SESSION_BUS_ADDRESS'] = self.bus.stdout.readline().strip()
+        self.connection = Gio.DBusConnection.new_for_address_sync(
+            self.env['DBUS_SESSION_BUS_ADDRESS'],
+            Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+            | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+            None, None)
+        self.service = None
+    
+    def tearDown(self):
+        """Stop the service and the private bus"""
+        if self.service is not None:
+            self.service.terminate()
+            self.service.wait()
+        self.connection.close_sync(None)
+        self.bus.terminate()
+        self.bus.wait()
+        self.bus.stdout.close()
+        shutil.rmtree(self.tmpdir)
+    
+    def _start_service(self, argv=None):
+        if not HAVE_NAUTILUS:
+            self.skipTest('the service needs the Nautilus typelib')
+        self.service = subprocess.Popen(
+            argv or [sys.executable, EXTENSION_PATH, '--service'], env=self.env)
+        self.assertTrue(self._iterate_until(self._service_running))
+    
+    def _service_running(self):
+        reply = self.connection.call_sync(
+            'org.freedesktop.DBus', '/org/freedesktop/DBus', 'org.freedesktop.DBus',
+            'NameHasOwner', GLib.Variant('(s)', (code_nautilus.SERVICE_NAME,)),
+            None, Gio.DBusCallFlags.NONE, -1, None)
+        return reply.unpack()[0]
+    
+    def _iterate_until(self, condition, timeout=5):
+        context = GLib.MainContext.default()
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            context.iteration(False)
+            time.sleep(0.01)
+        return condition()
+    
+    def _launched_args(self):
+        if not self._iterate_until(lambda: os.path.exists(self.output)):
+            return None
+        # The editor may not have finished writing yet
+        self._iterate_until(lambda: os.path.getsize(self.output) > 0)
+        with open(self.output) as output:
+            return output.read().split()
+    
+    def test_open_paths_launches_editor(self):
+        """Test OpenPaths canonicalizes the URIs and launches the editor"""
+        self._start_service()
+        uri = Gio.File.new_for_path(self.project).get_uri()
+        
+        self.connection.call_sync(
+            code_nautilus.SERVICE_NAME, code_nautilus.SERVICE_PATH,
+            code_nautilus.SERVICE_INTERFACE, 'OpenPaths',
+            GLib.Variant('(sasa{sv})', ('vscode', [uri, uri], {})),
+            None, Gio.DBusCallFlags.NONE, -1, None)
+        
+        self.assertEqual(self._launched_args(), ['--new-window', self.project])
+    
+    def test_open_paths_rejects_unknown_provider(self):
+        """Test OpenPaths reports unknown providers as invalid arguments"""
+        self._start_service()
+        
+        with self.assertRaises(GLib.Error) as context:
+            self.connection.call_sync(
+                code_nautilus.SERVICE_NAME, code_nautilus.SERVICE_PATH,
+                code_nautilus.SERVICE_INTERFACE, 'OpenPaths',
+                GLib.Variant('(sasa{sv})', ('notepad', [], {})),
+                None, Gio.DBusCallFlags.NONE, -1, None)
+        self.assertIn('InvalidArgs', context.exception.message)
+    
+    def test_client_uses_running_service(self):
+        """Test the client reads cached availability and launches via the service"""
+        self._start_service()
+        client = code_nautilus.LauncherClient(self.connection)
+        self.assertTrue(self._iterate_until(lambda: client.available_providers() is not None))
+        self.assertIn('vscode', client.available_providers())
+        
+        fallback = Mock()
+        uri = Gio.File.new_for_path(self.project).get_uri()
+        client.open_paths('vscode', [uri], {}, fallback)
+        
+        self.assertEqual(self._launched_args(), ['--new-window', self.project])
+        fallback.assert_not_called()
+    
+    def test_client_activates_installed_service(self):
+        """Test creating the client starts an installed but stopped service"""
+        if not HAVE_NAUTILUS:
+            self.skipTest('the service needs the Nautilus typelib')
+        services = os.path.join(self.env['XDG_DATA_HOME'], 'dbus-1', 'services')
+        os.makedirs(services)
+        with open(os.path.join(services, code_nautilus.SERVICE_NAME + '.service'), 'w') as service:
+            service.write('[D-BUS Service]\nName=%s\nExec=%s %s --service\n'
+                          % (code_nautilus.SERVICE_NAME, sys.executable, EXTENSION_PATH))
+        
+        on_unavailable = Mock()
+        client = code_nautilus.LauncherClient(self.connection, on_unavailable)
+        
+        self.assertTrue(self._iterate_until(lambda: client._ready))
+        self.assertTrue(self._service_running())
+        on_unavailable.assert_not_called()
+        
+        # Stop the activated service along with the bus
+        reply = self.connection.call_sync(
+            'org.freedesktop.DBus', '/org/freedesktop/DBus', 'org.freedesktop.DBus',
+            'GetConnectionUnixProcessID', GLib.Variant('(s)', (code_nautilus.SERVICE_NAME,)),
+            None, Gio.DBusCallFlags.NONE, -1, None)
+        self.addCleanup(os.kill, reply.unpack()[0], signal.SIGTERM)
+    
+    def test_client_falls_back_without_service(self):
+        """Test the client falls back to in-process launching when the service is missing"""
+        on_unavailable = Mock()
+        client = code_nautilus.LauncherClient(self.connection, on_unavailable)
+        self.assertTrue(self._iterate_until(lambda: client._ready))
+        self.assertIsNone(client.available_providers())
+        on_unavailable.assert_called_once()
+        
+        fallback = Mock()
+        client.open_paths('vscode', ['file:///'], {}, fallback)
+        
+        self.assertTrue(self._iterate_until(lambda: fallback.called))
+    
+    def test_client_falls_back_when_service_dies(self):
+        """Test the client falls back when the service exits before replying"""
+        # A service whose OpenPaths handler kills the whole process
+        bootstrap = (
+            'import importlib.util, os, signal, sys\n'
+            'spec = importlib.util.spec_from_file_location("code_nautilus", sys.argv[1])\n'
+            'module = importlib.util.module_from_spec(spec)\n'
+            'spec.loader.exec_module(module)\n'
+            'module.LauncherService.open_paths = '
+            'lambda *args: os.kill(os.getpid(), signal.SIGKILL)\n'
+            'module.LauncherService().run()\n')
+        self._start_service([sys.executable, '-c', bootstrap, EXTENSION_PATH])
+        client = code_nautilus.LauncherClient(self.connection)
+        self.assertTrue(self._iterate_until(lambda: client._ready))
+        
+        fallback = Mock()
+        uri = Gio.File.new_for_path(self.project).get_uri()
+        client.open_paths('vscode', [uri], {}, fallback)
+        
+        self.assertTrue(self._iterate_until(lambda: fallback.called))
+        self.assertEqual(self.service.wait(), -signal.SIGKILL)
+
+
+class TestLauncherClientReplies(TestCase):
+    """Tests for when the client falls back after a failed OpenPaths call"""
+    
+    def _finish_with(self, domain, code):
+        proxy = Mock()
+        proxy.call_finish.side_effect = GLib.Error.new_literal(domain, 'failed', code)
+        fallback = Mock()
+        code_nautilus.LauncherClient._on_open_paths_done(proxy, Mock(), fallback)
+        return fallback
+    
+    def test_no_reply_falls_back(self):
+        """Test a service that went away before replying triggers the fallback"""
+        fallback = self._finish_with(Gio.dbus_error_quark(), Gio.DBusError.NO_REPLY)
+        fallback.assert_called_once()
+    
+    def test_timeout_does_not_fall_back(self):
+        """Test a timed out call does not launch the editor a second time"""
+        fallback = self._finish_with(Gio.io_error_quark(), Gio.IOErrorEnum.TIMED_OUT)
+        fallback.assert_not_called()
+
+
+class TestLauncherServiceReplies(TestCase):
+    """Tests that every OpenPaths call is answered"""
+    
+    def setUp(self):
+        """Set up a service without a bus and a mock invocation"""
+        self.service = code_nautilus.LauncherService.__new__(code_nautilus.LauncherService)
+        self.invocation = Mock()
+        self.parameters = GLib.Variant('(sasa{sv})', ('vscode', ['file:///'], {}))
+    
+    def _call(self):
+        self.service._on_method_call(None, ':1.1', code_nautilus.SERVICE_PATH,
+                                     code_nautilus.SERVICE_INTERFACE, 'OpenPaths',
+                                     self.parameters, self.invocation)
+    
+    def test_unknown_provider_is_invalid_args(self):
+        """Test unknown providers are reported as invalid arguments"""
+        self.parameters = GLib.Variant('(sasa{sv})', ('notepad', [], {}))
+        self._call()
+        
+        error_name = self.invocation.return_dbus_error.call_args[0][0]
+        self.assertEqual(error_name, 'org.freedesktop.DBus.Error.InvalidArgs')
+    
+    def test_unexpected_error_is_reported_as_failed(self):
+        """Test unexpected errors get a reply so the client can fall back"""
+        with patch.object(self.service, 'open_paths', side_effect=RuntimeError('boom')):
+            self._call()
+        
+        self.invocation.return_dbus_error.assert_called_once_with(
+            'org.freedesktop.DBus.Error.Failed', 'boom')
+        self.invocation.return_value.assert_not_called()
+
+
+if __name__ == '__main__':
+    # Configure test runner
+    unittest.main(verbosity=2, buffer=True)